@@ -1,21 +1,55 @@
 import sys
 import os
+import re
 import subprocess
 import json
 import shutil
+import ctypes
+import functools
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import timedelta
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import av
+except ImportError:
+    av = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QPushButton, QLabel, QSlider, QFileDialog,
                              QGroupBox, QSpinBox, QComboBox, QCheckBox, QProgressBar,
                              QMessageBox, QLineEdit, QRadioButton, QButtonGroup, QScrollArea, 
-                             QDoubleSpinBox, QStyle, QSizePolicy, QFrame, QGridLayout)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QUrl, QSize, QObject
+                             QDoubleSpinBox, QStyle, QSizePolicy, QFrame, QGridLayout, QListWidget)
+from PyQt6.QtCore import Qt, pyqtSignal, QSignalBlocker, QTimer, QUrl, QSize, QObject, QRunnable, QThreadPool
 from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
 from PyQt6.QtMultimediaWidgets import QVideoWidget
 from PyQt6.QtGui import QFont, QPalette, QColor, QDragEnterEvent, QDropEvent, QIcon, QAction
 
+# --- 子行程共用設定 (Windows: 不顯示主控台視窗、轉檔時略為提高 ffmpeg 排程優先權) ---
+_STARTUPINFO = None
+_CREATION_FLAGS = 0
+_ENCODE_CREATION_FLAGS = 0
+if os.name == 'nt':
+    _STARTUPINFO = subprocess.STARTUPINFO()
+    _STARTUPINFO.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    _CREATION_FLAGS = subprocess.CREATE_NO_WINDOW
+    # 只用高於一般，x264 佔滿所有核心時介面與桌面仍能回應
+    _ENCODE_CREATION_FLAGS = _CREATION_FLAGS | subprocess.ABOVE_NORMAL_PRIORITY_CLASS
+
 # --- 工具函式 ---
+@functools.lru_cache(maxsize=None)
 def get_tool_path(filename):
     if hasattr(sys, '_MEIPASS'):
         return os.path.join(sys._MEIPASS, filename)
@@ -32,72 +66,340 @@ def get_tool_path(filename):
         
     return filename
 
-# --- GPU 檢測執行緒 ---
-class GPUCheckThread(QThread):
-    finished = pyqtSignal(str, str)
+def _physical_cores():
+    # 沒有 psutil 時以邏輯核心數的一半估計 (多數 CPU 有超執行緒)
+    cores = psutil.cpu_count(logical=False) if psutil else None
+    return cores or max(1, (os.cpu_count() or 2) // 2)
+
+# x264 超過實體核心數的 frame thread 效益有限，固定為實體核心數
+_X264_THREADS = _physical_cores()
+
+# ffmpeg -progress 輸出中的目前時間 (微秒)；開頭的 N/A 不會匹配
+_OUT_TIME_RE = re.compile(rb'out_time_us=(\d+)')
+
+# 精準剪輯時，頭尾片段需用與來源相同的編碼格式重新編碼，才能與中段直接串接
+_SMART_CUT_ENCODERS = {'h264': 'libx264', 'hevc': 'libx265'}
+# 串接後只有一組檔頭，profile 也要與來源一致 (ffprobe 回報的名稱 → 編碼器參數)
+_X264_PROFILES = {'Baseline': 'baseline', 'Constrained Baseline': 'baseline', 'Main': 'main',
+                  'High': 'high', 'High 10': 'high10', 'High 4:2:2': 'high422',
+                  'High 4:4:4 Predictive': 'high444'}
+_X265_PROFILES = {'Main': 'main', 'Main 10': 'main10', 'Main Still Picture': 'mainstillpicture'}
+
+@functools.lru_cache(maxsize=32)
+def _probe_codec(input_path, mtime, size, stream='v:0'):
+    # mtime / size 只用來當快取鍵，同一路徑的檔案被替換後會重新探測
+    ffprobe_path = get_tool_path("ffprobe.exe")
+    cmd = [ffprobe_path, '-v', 'error', '-select_streams', stream,
+           '-show_entries', 'stream=codec_name', '-of', 'csv=p=0', input_path]
+    result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='replace',
+                            startupinfo=_STARTUPINFO, creationflags=_CREATION_FLAGS)
+    lines = result.stdout.split()
+    return lines[0].strip() if lines else None
+
+def _probe_keyframes(input_path, start=None, end=None, offset=0.0):
+    # 只讀封包不解碼；有指定範圍時用 read_intervals 限制掃描範圍
+    # ffprobe 的時間戳與 read_intervals 都是絕對時間，offset 為檔案起始時間
+    # (MPEG-TS 等格式常不是 0)，進出都要換算才與滑桿時間一致
+    ffprobe_path = get_tool_path("ffprobe.exe")
+    cmd = [ffprobe_path, '-v', 'error', '-select_streams', 'v:0']
+    if start is not None:
+        cmd.extend(['-read_intervals', f'{start + offset}%{end + offset}'])
+    cmd.extend(['-show_entries', 'packet=pts_time,flags', '-of', 'csv', input_path])
+    result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='replace',
+                            startupinfo=_STARTUPINFO, creationflags=_CREATION_FLAGS)
+
+    pts_list = []
+    for line in result.stdout.splitlines():
+        fields = line.strip().split(',')
+        try:
+            if fields[0] == 'packet' and 'K' in fields[2]:
+                pts_list.append(float(fields[1]))
+        except (IndexError, ValueError):
+            continue
+    return sorted(pts - offset for pts in pts_list)
+
+# --- 來源影片資訊 (載入時探測一次，匯出時沿用) ---
+@dataclass(frozen=True)
+class SourceInfo:
+    duration: float
+    bitrate: float = 0  # kbps
+    start_time: float = 0.0  # 檔案起始時間戳 (秒)
+    width: object = 'N/A'
+    height: object = 'N/A'
+    fps: float = 0.0
+    video_codec: str = None
+    pix_fmt: str = None
+    profile: str = None
+    level: int = None  # ffprobe 的 level 數值，如 H.264 的 41、HEVC 的 123
+    audio_codec: str = None
+
+def _probe_source_av(path):
+    # 以 PyAV (libav) 在行程內讀取檔頭，不必啟動 ffprobe
+    with av.open(path) as container:
+        fields = {'duration': container.duration / av.time_base,
+                  'start_time': (container.start_time or 0) / av.time_base}
+        if container.bit_rate:
+            fields['bitrate'] = container.bit_rate / 1000
+        if container.streams.audio:
+            fields['audio_codec'] = container.streams.audio[0].codec_context.name
+        if container.streams.video:
+            stream = container.streams.video[0]
+            fields['width'] = stream.codec_context.width
+            fields['height'] = stream.codec_context.height
+            fields['fps'] = float(stream.average_rate or 0)
+            fields['video_codec'] = stream.codec_context.name
+            fields['pix_fmt'] = stream.codec_context.pix_fmt
+            fields['profile'] = stream.codec_context.profile
+            fields['level'] = getattr(stream.codec_context, 'level', None)
+    return SourceInfo(**fields)
+
+@functools.lru_cache(maxsize=32)
+def _probe_source(path, mtime, size):
+    # mtime / size 只用來當快取鍵，檔案被改寫後會重新探測
+    if av is not None:
+        try:
+            return _probe_source_av(path)
+        except Exception:
+            pass
+    
+    ffprobe_path = get_tool_path("ffprobe.exe")
+    # 只要求用得到的欄位；音訊串流也要保留 (AAC 直接複製判斷)
+    cmd = [ffprobe_path, '-v', 'quiet', '-print_format', 'json',
+           '-show_entries', 'format=duration,bit_rate,start_time:stream=codec_type,codec_name,width,height,r_frame_rate,pix_fmt,profile,level',
+           path]
+    result = subprocess.run(cmd, capture_output=True,
+                            startupinfo=_STARTUPINFO, creationflags=_CREATION_FLAGS)
+    # 直接解析位元組；有 orjson 時用 C 實作的解析器
+    info = orjson.loads(result.stdout) if orjson else json.loads(result.stdout)
+    
+    fmt = info['format']
+    video_stream = next((s for s in info['streams'] if s['codec_type'] == 'video'), None)
+    audio_stream = next((s for s in info['streams'] if s['codec_type'] == 'audio'), None)
+    
+    fields = {'duration': float(fmt['duration'])}
+    if 'start_time' in fmt:
+        fields['start_time'] = float(fmt['start_time'])
+    if 'bit_rate' in fmt:
+        fields['bitrate'] = int(fmt['bit_rate']) / 1000
+    if video_stream:
+        fields['width'] = video_stream.get('width', 'N/A')
+        fields['height'] = video_stream.get('height', 'N/A')
+        # r_frame_rate 為 "30000/1001" 這類分數字串，可能出現 "0/0"
+        num, _, den = video_stream.get('r_frame_rate', '0/1').partition('/')
+        fields['fps'] = int(num) / int(den) if den and int(den) else float(num)
+        fields['video_codec'] = video_stream.get('codec_name')
+        fields['pix_fmt'] = video_stream.get('pix_fmt')
+        fields['profile'] = video_stream.get('profile')
+        fields['level'] = video_stream.get('level')
+    if audio_stream:
+        fields['audio_codec'] = audio_stream.get('codec_name')
+    return SourceInfo(**fields)
+
+# --- 全 GPU 管線檢測 (結果快取，GPU 檢測時會一併更新) ---
+# 測試上傳到顯存的影格能否直接送進硬體編碼器，而不經過系統記憶體
+_HW_PIPELINE_TESTS = {
+    'NVIDIA': (['-init_hw_device', 'cuda=cu', '-filter_hw_device', 'cu'],
+               'format=nv12,hwupload,scale_cuda=640:360', 'h264_nvenc'),
+    'AMD': (['-init_hw_device', 'd3d11va=d3d', '-filter_hw_device', 'd3d'],
+            'format=nv12,hwupload', 'h264_amf'),
+}
+if os.name == 'nt':
+    _HW_PIPELINE_TESTS['Intel'] = (['-init_hw_device', 'qsv=hw', '-filter_hw_device', 'hw'],
+                                   'format=nv12,hwupload=extra_hw_frames=64,vpp_qsv=w=640:h=360', 'h264_qsv')
+else:
+    # Linux 以 VAAPI 解碼，再映射成 QSV 影格給 h264_qsv
+    _HW_PIPELINE_TESTS['Intel'] = (['-init_hw_device', 'vaapi=va', '-init_hw_device', 'qsv=hw@va',
+                                    '-filter_hw_device', 'va'],
+                                   'format=nv12,hwupload,scale_vaapi=w=640:h=360,hwmap=derive_device=qsv,format=qsv',
+                                   'h264_qsv')
+_hw_pipeline_cache = {}
+
+# 影格能留在顯存的來源: 各廠商都能硬體解碼的格式，且為 8-bit 4:2:0
+# (10-bit 會解成 p010，h264 編碼器不接受；無法硬體解碼時會退回軟體影格，硬體濾鏡就會失敗)
+_HW_DECODE_CODECS = frozenset({'h264', 'hevc', 'mpeg2video'})
+_HW_FRAME_PIX_FMTS = frozenset({'yuv420p', 'yuvj420p', 'nv12'})
+
+def _probe_hw_pipeline(vendor):
+    if vendor not in _HW_PIPELINE_TESTS:
+        return False
+    if vendor not in _hw_pipeline_cache:
+        init_args, vf, encoder = _HW_PIPELINE_TESTS[vendor]
+        ffmpeg_path = get_tool_path("ffmpeg.exe")
+        cmd = [ffmpeg_path, '-v', 'error', *init_args,
+               '-f', 'lavfi', '-i', 'color=s=1280x720:d=1',
+               '-vf', vf, '-c:v', encoder, '-f', 'null', '-']
+        try:
+            result = subprocess.run(cmd, capture_output=True,
+                                    startupinfo=_STARTUPINFO, creationflags=_CREATION_FLAGS)
+            _hw_pipeline_cache[vendor] = result.returncode == 0
+        except Exception:
+            _hw_pipeline_cache[vendor] = False
+    return _hw_pipeline_cache[vendor]
+
+# 需要較新 NVENC 硬體的參數；不支援的顯卡上 ffmpeg 會直接中止，使用前先測試
+_NVENC_TEMPORAL_AQ = ('-temporal-aq', '1')
+_NVENC_B_REF = ('-b_ref_mode', 'middle')
+
+@functools.lru_cache(maxsize=None)
+def _nvenc_supports(*args):
+    ffmpeg_path = get_tool_path("ffmpeg.exe")
+    cmd = [ffmpeg_path, '-v', 'error', '-f', 'lavfi', '-i', 'color=s=1280x720:d=0.2',
+           '-c:v', 'h264_nvenc', *args, '-f', 'null', '-']
+    try:
+        result = subprocess.run(cmd, capture_output=True,
+                                startupinfo=_STARTUPINFO, creationflags=_CREATION_FLAGS)
+    except Exception:
+        return False
+    return result.returncode == 0
+
+@functools.lru_cache(maxsize=None)
+def _ffmpeg_filters():
+    ffmpeg_path = get_tool_path("ffmpeg.exe")
+    try:
+        result = subprocess.run([ffmpeg_path, '-hide_banner', '-filters'], capture_output=True,
+                                text=True, encoding='utf-8', errors='replace',
+                                startupinfo=_STARTUPINFO, creationflags=_CREATION_FLAGS)
+    except Exception:
+        return frozenset()
+    # 每行格式: " T.. scale_cuda        V->V       說明"
+    return frozenset(line.split()[1] for line in result.stdout.splitlines() if len(line.split()) > 2)
+
+def _scale_filter(vendor, resolution, hw_frames):
+    # 影格留在顯存時改用對應廠商的硬體縮放，避免插入軟體 scale 造成 hwdownload/hwupload 來回搬移
+    if not hw_frames:
+        return f'scale={resolution}'
+    w, h = resolution.split(':')
+    if vendor == 'NVIDIA':
+        return f'scale_cuda={w}:{h}'
+    if vendor == 'AMD':
+        if 'scale_d3d11' in _ffmpeg_filters():
+            return f'scale_d3d11={w}:{h}'
+        # 舊版 ffmpeg 沒有 scale_d3d11，下載回系統記憶體縮放後交給 AMF
+        return f'hwdownload,format=nv12,scale={w}:{h}'
+    if vendor == 'Intel':
+        if os.name == 'nt':
+            return f'vpp_qsv=w={w}:h={h}'
+        return f'scale_vaapi=w={w}:h={h}'
+    return f'scale={resolution}'
+
+_DISPLAY_DEVICE_MIRRORING_DRIVER = 0x8
+
+def _enum_display_adapters():
+    # 直接呼叫 user32 列舉顯示卡，不必啟動 PowerShell
+    from ctypes import wintypes
+
+    class DISPLAY_DEVICEW(ctypes.Structure):
+        _fields_ = [('cb', wintypes.DWORD),
+                    ('DeviceName', wintypes.WCHAR * 32),
+                    ('DeviceString', wintypes.WCHAR * 128),
+                    ('StateFlags', wintypes.DWORD),
+                    ('DeviceID', wintypes.WCHAR * 128),
+                    ('DeviceKey', wintypes.WCHAR * 128)]
+
+    # 回傳 [(顯卡名稱, 登錄檔 DeviceKey), ...]
+    adapters = []
+    for i in range(16):
+        dd = DISPLAY_DEVICEW()
+        dd.cb = ctypes.sizeof(dd)
+        if not ctypes.windll.user32.EnumDisplayDevicesW(None, i, ctypes.byref(dd), 0):
+            break
+        # 同一張卡的每個輸出都會列出一次，去除重複與鏡像驅動
+        if dd.StateFlags & _DISPLAY_DEVICE_MIRRORING_DRIVER:
+            continue
+        if dd.DeviceString and all(dd.DeviceString != name for name, _ in adapters):
+            adapters.append((dd.DeviceString, dd.DeviceKey))
+    return adapters
+
+def _driver_version(device_key):
+    # DeviceKey 形如 \Registry\Machine\System\CurrentControlSet\Control\Video\{GUID}\0000
+    import winreg
+    prefix = '\\registry\\machine\\'
+    if not device_key.lower().startswith(prefix):
+        return None
+    try:
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, device_key[len(prefix):]) as key:
+            return str(winreg.QueryValueEx(key, 'DriverVersion')[0])
+    except OSError:
+        return None
+
+def _gpu_cache_path():
+    base = os.environ.get('APPDATA') or os.path.expanduser('~')
+    return os.path.join(base, 'vediocutter', 'gpu_cache.json')
+
+# --- GPU 檢測工作 ---
+class GPUCheckRunnable(QRunnable):
+    class Signals(QObject):
+        finished = pyqtSignal(str, str)
+
+    def __init__(self, cache_only=False):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = GPUCheckRunnable.Signals()
+        # cache_only: 啟動時只讀取上次的結果，沒有可用的快取就不發送訊號
+        # 使用者按下檢測時一律重新測試，避免一直沿用失敗的結果
+        self.cache_only = cache_only
 
     def run(self):
         report = []
         available_vendors = []
         ffmpeg_path = get_tool_path("ffmpeg.exe")
 
-        report.append("【硬體偵測】")
-        try:
-            ps_cmd = "Get-CimInstance Win32_VideoController | Select-Object -ExpandProperty Name"
-            cmd = ["powershell", "-NoProfile", "-Command", ps_cmd]
-            
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, startupinfo=startupinfo)
-            
-            if result.returncode == 0:
-                gpus = [line.strip() for line in result.stdout.split('\n') if line.strip()]
-                for gpu in gpus:
-                    report.append(f"• {gpu}")
-            else:
-                report.append("無法讀取硬體列表")
-        except Exception as e:
-            report.append(f"硬體讀取錯誤: {e}")
-        
-        report.append("\n【加速功能診斷】")
-        
-        if not os.path.exists(ffmpeg_path) and not shutil.which("ffmpeg"):
-             report.append(f"❌ 嚴重警告: 找不到 ffmpeg.exe！\n搜尋路徑: {os.path.dirname(ffmpeg_path)}")
-
         tests = [
             ("NVIDIA", "h264_nvenc"),
             ("AMD", "h264_amf"),
             ("Intel", "h264_qsv")
         ]
 
-        for vendor, encoder in tests:
-            test_cmd = [
-                ffmpeg_path, 
-                '-y', 
-                '-v', 'error',
-                '-f', 'lavfi', '-i', 'color=s=1920x1080:d=1',
-                '-c:v', encoder,
-                '-f', 'null', '-'
-            ]
-            
+        gpu_lines, drivers = self._query_gpus()
+
+        # 顯卡、驅動版本與 ffmpeg 都沒變動時，上次的檢測結果仍然有效
+        # 讀不到驅動版本時無法判斷是否更新過，不使用快取
+        fingerprint = None
+        if drivers and all(drivers):
             try:
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                
-                proc = subprocess.run(test_cmd, capture_output=True, text=True, startupinfo=startupinfo)
-                
-                if proc.returncode == 0:
-                    report.append(f"✅ {vendor}: 支援 (可用)")
-                    available_vendors.append(vendor)
+                ffmpeg_mtime = os.path.getmtime(ffmpeg_path)
+            except OSError:
+                ffmpeg_mtime = 0
+            fingerprint = json.dumps([gpu_lines, drivers, ffmpeg_path, ffmpeg_mtime], ensure_ascii=False)
+
+        if self.cache_only:
+            cached = self._load_cache(fingerprint) if fingerprint else None
+            if cached:
+                _hw_pipeline_cache.update(cached['pipeline'])
+                self.signals.finished.emit(cached['report'], cached['vendor'])
+            return
+
+        # 各編碼器檢測互不相依，同時執行，總耗時只取決於最慢的一項
+        with ThreadPoolExecutor(max_workers=len(tests)) as pool:
+            futures = [pool.submit(self._probe_encoder, ffmpeg_path, vendor, encoder)
+                       for vendor, encoder in tests]
+            results = {}
+            for future in as_completed(futures):
+                vendor, ok, full_gpu, err_msg = future.result()
+                results[vendor] = (ok, full_gpu, err_msg)
+
+        report.append("【硬體偵測】")
+        report.extend(gpu_lines)
+        
+        report.append("\n【加速功能診斷】")
+        
+        if not os.path.exists(ffmpeg_path) and not shutil.which("ffmpeg"):
+             report.append(f"❌ 嚴重警告: 找不到 ffmpeg.exe！\n搜尋路徑: {os.path.dirname(ffmpeg_path)}")
+
+        for vendor, _ in tests:
+            ok, full_gpu, err_msg = results[vendor]
+            if ok:
+                if full_gpu:
+                    report.append(f"✅ {vendor}: 支援 (可用，全 GPU 管線)")
                 else:
-                    err_msg = proc.stderr.strip() if proc.stderr else "未知錯誤"
-                    if "device not found" in err_msg:
-                        report.append(f"❌ {vendor}: 未偵測到對應硬體")
-                    else:
-                        report.append(f"❌ {vendor}: 測試未通過")
-            except Exception:
+                    report.append(f"✅ {vendor}: 支援 (可用)")
+                available_vendors.append(vendor)
+            elif err_msg is None:
                 report.append(f"❌ {vendor}: 執行失敗")
+            elif "device not found" in err_msg:
+                report.append(f"❌ {vendor}: 未偵測到對應硬體")
+            else:
+                report.append(f"❌ {vendor}: 測試未通過")
 
         rec_vendor = "CPU"
         report.append("\n【結果建議】")
@@ -114,27 +416,137 @@ class GPUCheckThread(QThread):
             report.append("未偵測到可用的硬體加速，建議使用 CPU 模式。")
 
         final_msg = "\n".join(report)
-        self.finished.emit(final_msg, rec_vendor)
+        if fingerprint:
+            self._save_cache(fingerprint, final_msg, rec_vendor)
+        self.signals.finished.emit(final_msg, rec_vendor)
+
+    def _load_cache(self, fingerprint):
+        try:
+            with open(_gpu_cache_path(), 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cached.get('fingerprint') != fingerprint:
+            return None
+        return cached
+
+    def _save_cache(self, fingerprint, report_text, rec_vendor):
+        cache_path = _gpu_cache_path()
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump({'fingerprint': fingerprint, 'report': report_text, 'vendor': rec_vendor,
+                           'pipeline': dict(_hw_pipeline_cache)}, f, ensure_ascii=False)
+        except OSError:
+            pass
+
+    def _query_gpus(self):
+        # 回傳 (報告用的顯卡列表, 各顯卡的驅動版本)
+        try:
+            adapters = _enum_display_adapters()
+            if adapters:
+                return ([f"• {name}" for name, _ in adapters],
+                        [_driver_version(key) for _, key in adapters])
+        except Exception:
+            pass
+
+        lines = []
+        drivers = []
+        try:
+            ps_cmd = "Get-CimInstance Win32_VideoController | ForEach-Object { $_.Name + '|' + $_.DriverVersion }"
+            cmd = ["powershell", "-NoProfile", "-Command", ps_cmd]
+            
+            result = subprocess.run(cmd, capture_output=True, text=True,
+                                    startupinfo=_STARTUPINFO, creationflags=_CREATION_FLAGS)
+            
+            if result.returncode == 0:
+                gpus = [line.strip() for line in result.stdout.split('\n') if line.strip()]
+                for gpu in gpus:
+                    name, _, driver = gpu.partition('|')
+                    lines.append(f"• {name}")
+                    drivers.append(driver or None)
+            else:
+                lines.append("無法讀取硬體列表")
+        except Exception as e:
+            lines.append(f"硬體讀取錯誤: {e}")
+        return lines, drivers
+
+    def _probe_encoder(self, ffmpeg_path, vendor, encoder):
+        # 回傳 (廠商, 編碼器可用, 全 GPU 管線可用, 錯誤訊息)；錯誤訊息為 None 代表無法執行
+        test_cmd = [
+            ffmpeg_path, 
+            '-y', 
+            '-v', 'error',
+            '-f', 'lavfi', '-i', 'color=s=1920x1080:d=1',
+            '-c:v', encoder,
+            '-f', 'null', '-'
+        ]
+        
+        try:
+            proc = subprocess.run(test_cmd, capture_output=True, text=True,
+                                  startupinfo=_STARTUPINFO, creationflags=_CREATION_FLAGS)
+        except Exception:
+            return vendor, False, False, None
+
+        if proc.returncode != 0:
+            _hw_pipeline_cache[vendor] = False
+            return vendor, False, False, proc.stderr.strip() if proc.stderr else "未知錯誤"
+
+        _hw_pipeline_cache.pop(vendor, None)
+        if vendor == 'NVIDIA':
+            # 順便測試進階參數，匯出時就不必再等
+            _nvenc_supports(*_NVENC_TEMPORAL_AQ)
+            _nvenc_supports(*_NVENC_B_REF)
+        return vendor, True, _probe_hw_pipeline(vendor), ""
+
+# --- 影片資訊探測工作 ---
+class ProbeRunnable(QRunnable):
+    class Signals(QObject):
+        done = pyqtSignal(str, object)    # (影片路徑, SourceInfo)
+        failed = pyqtSignal(str, str)     # (影片路徑, 錯誤訊息)
+
+    def __init__(self, path):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = ProbeRunnable.Signals()
+        self.path = path
+
+    def run(self):
+        try:
+            info = _probe_source(self.path, os.path.getmtime(self.path), os.path.getsize(self.path))
+        except Exception as e:
+            self.signals.failed.emit(self.path, str(e))
+            return
+        self.signals.done.emit(self.path, info)
 
 # --- 可點擊跳轉的 Slider ---
 class ClickableSlider(QSlider):
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
-            val = self.minimum() + (self.maximum() - self.minimum()) * event.position().x() / self.width()
-            self.setValue(int(val))
-            self.sliderMoved.emit(int(val))
+            val = QStyle.sliderValueFromPosition(self.minimum(), self.maximum(),
+                                                 int(event.position().x()), self.width(),
+                                                 self.invertedAppearance())
+            # 點在目前位置上不重複通知，避免連點時反覆要求播放器跳轉
+            if val != self.value():
+                self.setValue(val)
+                self.sliderMoved.emit(val)
             event.accept()
         super().mousePressEvent(event)
 
 # --- 影片處理執行緒 ---
-class VideoProcessor(QThread):
-    progress = pyqtSignal(int)
-    finished = pyqtSignal(bool, str)
+class VideoProcessor(QRunnable):
+    # QRunnable 不是 QObject，訊號放在獨立的 QObject 上
+    class Signals(QObject):
+        progress = pyqtSignal(int)
+        finished = pyqtSignal(bool, str)
     
     def __init__(self, input_path, output_path, start_time, end_time, 
                  mode='copy', quality=23, fps=None, bitrate=None, 
-                 output_format='mp4', resolution=None, gpu_vendor='CPU', speed=1.0):
+                 output_format='mp4', resolution=None, gpu_vendor='CPU', speed=1.0,
+                 nvenc_preset='p5', source_info=None):
         super().__init__()
+        self.setAutoDelete(False)
+        self.signals = VideoProcessor.Signals()
         self.input_path = input_path
         self.output_path = output_path
         self.start_time = start_time
@@ -147,117 +559,287 @@ class VideoProcessor(QThread):
         self.resolution = resolution
         self.gpu_vendor = gpu_vendor
         self.speed = speed
+        self.nvenc_preset = nvenc_preset
+        self.source_info = source_info
         self.process = None
+        self._last_emit_t = 0.0
+        self._last_pct = -1
         
     def run(self):
         try:
-            duration = self.end_time - self.start_time
-            ffmpeg_path = get_tool_path("ffmpeg.exe")
-            
-            cmd = [ffmpeg_path]
-            
-            # 硬體解碼
-            if self.gpu_vendor == 'NVIDIA':
-                cmd.extend(['-hwaccel', 'cuda'])
-            elif self.gpu_vendor == 'Intel':
-                cmd.extend(['-hwaccel', 'qsv'])
-            elif self.gpu_vendor == 'AMD':
-                cmd.extend(['-hwaccel', 'dxva2']) 
+            if self._process(get_tool_path("ffmpeg.exe")):
+                self.signals.finished.emit(True, "影片剪輯完成！")
+            else:
+                self.signals.finished.emit(False, "剪輯錯誤，請檢查設定或硬體支援。")
+                
+        except Exception as e:
+            self.signals.finished.emit(False, f"錯誤: {str(e)}")
+    
+    def _process(self, ffmpeg_path):
+        # 依目前的 start_time / end_time / output_path 輸出一段影片
+        duration = self.end_time - self.start_time
+        
+        if self.mode == 'smart':
+            return self._run_smart_cut(ffmpeg_path)
+        
+        cmd = [ffmpeg_path]
+        hw_frames = False
+        if self.mode != 'copy':
+            hwaccel_args, hw_frames = self._hwaccel_args()
+            cmd.extend(hwaccel_args)
+        
+        cmd.extend(['-ss', str(self.start_time)])
+        if self.mode == 'copy':
+            # 直接對齊最近的關鍵幀，不做多餘的解碼
+            cmd.append('-noaccurate_seek')
+        cmd.extend(['-i', self.input_path])
+        cmd.extend(['-t', str(duration)])
+        
+        if self.mode == 'copy':
+            cmd.extend(['-c', 'copy', '-avoid_negative_ts', 'make_zero'])
+        else:
+            cmd.extend(self._video_encoder_args())
             
-            cmd.extend(['-ss', str(self.start_time)])
-            cmd.extend(['-i', self.input_path])
-            cmd.extend(['-t', str(duration)])
+            # 濾鏡與音訊處理
+            video_filters = self._video_filters(hw_frames)
+            if video_filters:
+                cmd.extend(['-vf', ','.join(video_filters)])
             
-            if self.mode == 'copy':
-                cmd.extend(['-c', 'copy'])
+            # 未變速且來源已是 AAC 時直接複製音訊，省去一次解碼+編碼
+            if (self.speed == 1.0 and self.output_format in ('mp4', 'mkv', 'mov')
+                    and self._source_codec('a:0') == 'aac'):
+                cmd.extend(['-c:a', 'copy'])
             else:
-                # --- [全顯卡完美修正版] 編碼器設定 ---
-                if self.gpu_vendor == 'NVIDIA':
-                    cmd.extend(['-c:v', 'h264_nvenc', '-preset', 'p4'])
-                    if not self.bitrate:
-                        if self.quality == 0:
-                            # NVIDIA: 0 = Auto(爛畫質)，所以必須強制用 constqp 0 (無損)
-                            cmd.extend(['-rc', 'constqp', '-qp', '0'])
-                        else:
-                            # NVIDIA: 非 0 時用 VBR，並解除碼率上限
-                            cmd.extend(['-rc', 'vbr', '-cq', str(self.quality), '-b:v', '0'])
-                
-                elif self.gpu_vendor == 'AMD':
-                    cmd.extend(['-c:v', 'h264_amf', '-usage', 'transcoding'])
-                    if not self.bitrate:
-                        # AMD: 0 就是 0 (無損)，直接用沒問題
-                        cmd.extend(['-rc', 'cqp', '-qp_i', str(self.quality), '-qp_p', str(self.quality)])
-                
-                elif self.gpu_vendor == 'Intel':
-                    cmd.extend(['-c:v', 'h264_qsv', '-preset', 'medium'])
-                    if not self.bitrate:
-                        # Intel: 範圍通常是 1-51，0 可能會無效，所以遇到 0 我們改成 1 (最高畫質)
-                        q_val = 1 if self.quality == 0 else self.quality
-                        cmd.extend(['-global_quality', str(q_val)])
-                
-                else: # CPU (x264)
-                    cmd.extend(['-c:v', 'libx264', '-preset', 'medium'])
-                    if not self.bitrate:
-                        # CPU: 0 代表無損，直接用沒問題
-                        cmd.extend(['-crf', str(self.quality)])
-                
-                # 碼率設定 (若有勾選，這會覆蓋上面的 CRF 設定)
-                if self.bitrate:
-                    b_val = f'{self.bitrate}k'
-                    cmd.extend(['-b:v', b_val, '-maxrate', b_val, '-bufsize', f'{self.bitrate * 2}k'])
-                
-                # 濾鏡與音訊處理
-                video_filters = []
-                if self.resolution:
-                    video_filters.append(f'scale={self.resolution}')
-                if self.speed != 1.0:
-                    video_filters.append(f'setpts={1/self.speed}*PTS')
-                
-                if video_filters:
-                    cmd.extend(['-vf', ','.join(video_filters)])
-                
                 cmd.extend(['-c:a', 'aac', '-b:a', '192k'])
                 if self.speed != 1.0:
                     cmd.extend(['-af', f'atempo={self.speed}'])
-                
-                if self.fps:
-                    cmd.extend(['-r', str(self.fps)])
             
-            cmd.extend(['-y', self.output_path])
-            print("執行指令:", " ".join(cmd))
-
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW if os.name == 'nt' else 0
+            if self.fps:
+                cmd.extend(['-r', str(self.fps)])
+        
+        cmd.extend(self._container_args())
+        cmd.extend(['-y', self.output_path])
+        
+        return self._run_ffmpeg(cmd, 0, duration / self.speed) == 0
+    
+    def _source_codec(self, stream):
+        # 優先使用載入時探測好的資訊，沒有時才另外呼叫 ffprobe
+        if self.source_info:
+            return self.source_info.video_codec if stream.startswith('v') else self.source_info.audio_codec
+        return _probe_codec(self.input_path, os.path.getmtime(self.input_path),
+                            os.path.getsize(self.input_path), stream)
+    
+    def _hw_frames_supported(self):
+        # 沒有來源資訊時無法判斷，保守地讓影格回到系統記憶體
+        info = self.source_info
+        return bool(info) and info.video_codec in _HW_DECODE_CODECS and info.pix_fmt in _HW_FRAME_PIX_FMTS
+    
+    def _hwaccel_args(self):
+        # 回傳 (硬體解碼參數, 影格是否留在顯存)
+        full_gpu = self._hw_frames_supported()
+        if self.gpu_vendor == 'NVIDIA':
+            if full_gpu and _probe_hw_pipeline('NVIDIA'):
+                # 解碼後影格留在顯存，濾鏡與 nvenc 直接處理 CUDA 影格
+                return ['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda'], True
+            return ['-hwaccel', 'cuda'], False
+        elif self.gpu_vendor == 'Intel':
+            if full_gpu and _probe_hw_pipeline('Intel'):
+                # 解碼後的 surface 留在顯存，直接交給 h264_qsv
+                if os.name == 'nt':
+                    return ['-init_hw_device', 'qsv=hw', '-filter_hw_device', 'hw',
+                            '-hwaccel', 'qsv', '-hwaccel_output_format', 'qsv'], True
+                return ['-init_hw_device', 'vaapi=va', '-init_hw_device', 'qsv=hw@va',
+                        '-filter_hw_device', 'hw', '-hwaccel', 'vaapi',
+                        '-hwaccel_device', 'va', '-hwaccel_output_format', 'vaapi'], True
+            return ['-hwaccel', 'qsv' if os.name == 'nt' else 'vaapi'], False
+        elif self.gpu_vendor == 'AMD':
+            if full_gpu and _probe_hw_pipeline('AMD'):
+                # AMF 可直接讀取 D3D11 貼圖，影格不必回到系統記憶體
+                return ['-hwaccel', 'd3d11va', '-hwaccel_output_format', 'd3d11'], True
+            return ['-hwaccel', 'd3d11va'], False
+        return [], False
+    
+    def _video_encoder_args(self):
+        # --- [全顯卡完美修正版] 編碼器設定 ---
+        args = []
+        if self.gpu_vendor == 'NVIDIA':
+            args.extend(['-c:v', 'h264_nvenc', '-preset', self.nvenc_preset, '-tune', 'hq',
+                         '-rc-lookahead', '32', '-spatial-aq', '1'])
+            if _nvenc_supports(*_NVENC_TEMPORAL_AQ):
+                args.extend(_NVENC_TEMPORAL_AQ)
+            if not self.bitrate:
+                if self.quality == 0:
+                    # NVIDIA: 0 = Auto(爛畫質)，所以必須強制用 constqp 0 (無損)
+                    args.extend(['-rc', 'constqp', '-qp', '0'])
+                else:
+                    # NVIDIA: 非 0 時用 VBR，並解除碼率上限
+                    args.extend(['-rc', 'vbr', '-cq', str(self.quality), '-b:v', '0'])
+            else:
+                # NVIDIA: 限制碼率時用 B 幀參考與 1/4 解析度預分析，讓碼率分配更精準
+                if _nvenc_supports(*_NVENC_B_REF):
+                    args.extend(_NVENC_B_REF)
+                args.extend(['-multipass', 'qres'])
+        
+        elif self.gpu_vendor == 'AMD':
+            args.extend(['-c:v', 'h264_amf', '-usage', 'transcoding'])
+            if not self.bitrate:
+                # AMD: 0 就是 0 (無損)，直接用沒問題
+                args.extend(['-rc', 'cqp', '-qp_i', str(self.quality), '-qp_p', str(self.quality)])
+        
+        elif self.gpu_vendor == 'Intel':
+            args.extend(['-c:v', 'h264_qsv', '-preset', 'medium'])
+            if not self.bitrate:
+                # Intel: 範圍通常是 1-51，0 可能會無效，所以遇到 0 我們改成 1 (最高畫質)
+                q_val = 1 if self.quality == 0 else self.quality
+                args.extend(['-global_quality', str(q_val)])
+        
+        else: # CPU (x264)
+            args.extend(['-c:v', 'libx264', '-preset', 'medium', '-threads', str(_X264_THREADS),
+                         '-x264-params', f'threads={_X264_THREADS}:lookahead-threads=2'])
+            if not self.bitrate:
+                # CPU: 0 代表無損，直接用沒問題
+                args.extend(['-crf', str(self.quality)])
+        
+        # 碼率設定 (若有勾選，這會覆蓋上面的 CRF 設定)
+        if self.bitrate:
+            b_val = f'{self.bitrate}k'
+            args.extend(['-b:v', b_val, '-maxrate', b_val, '-bufsize', f'{self.bitrate * 2}k'])
+        return args
+    
+    def _video_filters(self, hw_frames):
+        video_filters = []
+        if self.resolution:
+            video_filters.append(_scale_filter(self.gpu_vendor, self.resolution, hw_frames))
+        if self.speed != 1.0:
+            video_filters.append(f'setpts={1/self.speed}*PTS')
+        if hw_frames and self.gpu_vendor == 'Intel' and os.name != 'nt':
+            video_filters.append('hwmap=derive_device=qsv,format=qsv')
+        return video_filters
+    
+    def _container_args(self):
+        # moov 移到檔頭，播放器不必掃完整個檔案才能開始播放
+        if self.output_format in ('mp4', 'mov', 'm4v'):
+            return ['-movflags', '+faststart']
+        return []
+    
+    def _run_ffmpeg(self, cmd, offset, total):
+        # offset / total 為秒數，讓多段指令可共用同一條進度條
+        # 進度改由 -progress 輸出的 key=value 讀取，不再解析 stderr 的統計行
+        cmd = [cmd[0], '-progress', 'pipe:1', '-nostats'] + cmd[1:]
+        print("執行指令:", " ".join(cmd))
 
-            self.process = subprocess.Popen(
-                cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                universal_newlines=True, encoding='utf-8', errors='replace',
-                startupinfo=startupinfo
-            )
-            
-            # 進度條... (以下省略，維持原樣)
-            for line in self.process.stderr:
-                if 'time=' in line:
-                    try:
-                        time_str = line.split('time=')[1].split()[0]
-                        h, m, s = time_str.split(':')
-                        current = int(h) * 3600 + int(m) * 60 + float(s)
-                        expected_duration = duration / self.speed
-                        if expected_duration > 0:
-                            progress_percent = min(int((current / expected_duration) * 100), 100)
-                            self.progress.emit(progress_percent)
-                    except:
-                        pass
+        # 以位元組模式讀取，省去每一行的 UTF-8 解碼
+        self.process = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            startupinfo=_STARTUPINFO, creationflags=_ENCODE_CREATION_FLAGS
+        )
+        
+        for line in self.process.stdout:
+            m = _OUT_TIME_RE.match(line)
+            if m and total > 0:
+                current = int(m.group(1)) / 1_000_000
+                progress_percent = min(int(((offset + current) / total) * 100), 100)
+                self._report_progress(progress_percent)
+        
+        self.process.wait()
+        return self.process.returncode
+    
+    def _report_progress(self, percent):
+        # 只在百分比有變化且距上次超過 100ms 時才發送，減少跨執行緒訊號
+        now = time.monotonic()
+        if percent != self._last_pct and now - self._last_emit_t > 0.1:
+            self.signals.progress.emit(percent)
+            self._last_pct = percent
+            self._last_emit_t = now
+    
+    def _run_smart_cut(self, ffmpeg_path):
+        # 精準剪輯: 中段依關鍵幀直接複製，只重新編碼頭尾不足一個 GOP 的片段
+        duration = self.end_time - self.start_time
+        codec = self._source_codec('v:0')
+        encoder = _SMART_CUT_ENCODERS.get(codec, 'libx264')
+        # 關鍵幀只在精準剪輯時需要，匯出時才掃描剪輯範圍內的封包
+        keyframes = _probe_keyframes(self.input_path, self.start_time, self.end_time,
+                                     self._source_details().start_time)
+        keyframes = [k for k in keyframes if self.start_time <= k <= self.end_time]
+        
+        if codec not in _SMART_CUT_ENCODERS or len(keyframes) < 2:
+            # 範圍內沒有完整的 GOP (或格式不支援串接)，整段重新編碼
+            cmd = [ffmpeg_path, '-ss', str(self.start_time), '-i', self.input_path,
+                   '-t', str(duration), '-c:v', encoder, '-preset', 'medium', '-crf', '18',
+                   '-c:a', 'aac', '-b:a', '192k']
+            cmd.extend(self._container_args())
+            cmd.extend(['-y', self.output_path])
+            return self._run_ffmpeg(cmd, 0, duration) == 0
+        
+        k1, k2 = keyframes[0], keyframes[-1]
+        segments = []
+        if k1 > self.start_time:
+            segments.append((self.start_time, k1, False))
+        segments.append((k1, k2, True))
+        if k2 < self.end_time:
+            segments.append((k2, self.end_time, False))
+        
+        work_dir = tempfile.mkdtemp(prefix='vediocutter_')
+        try:
+            parts = []
+            offset = 0
+            for i, (seg_start, seg_end, copy) in enumerate(segments):
+                # 使用 ts 暫存檔，SPS/PPS 會跟著關鍵幀寫入，重新編碼的片段才能直接串接
+                part = os.path.join(work_dir, f'part{i}.ts')
+                cmd = [ffmpeg_path, '-ss', str(seg_start), '-i', self.input_path,
+                       '-t', str(seg_end - seg_start), '-an']
+                if copy:
+                    cmd.extend(['-c:v', 'copy'])
+                else:
+                    cmd.extend(self._smart_cut_encoder_args(codec))
+                cmd.extend(['-y', part])
+                if self._run_ffmpeg(cmd, offset, duration) != 0:
+                    return False
+                offset += seg_end - seg_start
+                parts.append(part)
             
-            self.process.wait()
+            list_path = os.path.join(work_dir, 'concat.txt')
+            with open(list_path, 'w', encoding='utf-8') as f:
+                for part in parts:
+                    escaped = part.replace("'", "'\\''")
+                    f.write(f"file '{escaped}'\n")
             
-            if self.process.returncode == 0:
-                self.finished.emit(True, "影片剪輯完成！")
-            else:
-                self.finished.emit(False, "剪輯錯誤，請檢查設定或硬體支援。")
-                
-        except Exception as e:
-            self.finished.emit(False, f"錯誤: {str(e)}")
+            # 影像串接各片段，音訊直接從原檔依時間範圍複製
+            cmd = [ffmpeg_path, '-f', 'concat', '-safe', '0', '-i', list_path,
+                   '-ss', str(self.start_time), '-t', str(duration), '-i', self.input_path,
+                   '-map', '0:v', '-map', '1:a?', '-c', 'copy']
+            cmd.extend(self._container_args())
+            cmd.extend(['-y', self.output_path])
+            return self._run_ffmpeg(cmd, duration, duration) == 0
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    
+    def _source_details(self):
+        # 載入時已探測過就直接沿用，否則以同一個快取的探測補上
+        if self.source_info:
+            return self.source_info
+        return _probe_source(self.input_path, os.path.getmtime(self.input_path),
+                             os.path.getsize(self.input_path))
+    
+    def _smart_cut_encoder_args(self, codec):
+        # 重新編碼的頭尾片段與直接複製的中段共用同一組檔頭，
+        # pix_fmt / profile / level 與來源不一致時播放器會解錯中段的 GOP
+        info = self._source_details()
+        args = ['-c:v', _SMART_CUT_ENCODERS[codec], '-preset', 'medium', '-crf', '18']
+        if info.pix_fmt:
+            args.extend(['-pix_fmt', info.pix_fmt])
+        level = info.level if isinstance(info.level, int) and info.level > 0 else None
+        if codec == 'h264':
+            if info.profile in _X264_PROFILES:
+                args.extend(['-profile:v', _X264_PROFILES[info.profile]])
+            if level:
+                args.extend(['-level:v', f'{level / 10:g}'])
+        else:
+            if info.profile in _X265_PROFILES:
+                args.extend(['-profile:v', _X265_PROFILES[info.profile]])
+            if level:
+                args.extend(['-x265-params', f'level-idc={level / 30:g}'])
+        return args
     
     def _time_to_seconds(self, time_str):
         try:
@@ -270,18 +852,133 @@ class VideoProcessor(QThread):
         if self.process:
             self.process.terminate()
 
+# --- 批次剪輯執行緒 ---
+# 涵蓋範圍超過片段總長的這個倍數時，改為逐段剪輯
+_SINGLE_PASS_MAX_SPAN_RATIO = 2
+class BatchVideoProcessor(VideoProcessor):
+    # clips: [(開始秒數, 結束秒數, 輸出路徑), ...]，所有片段共用同一組輸出設定
+    def __init__(self, input_path, clips, **settings):
+        super().__init__(input_path, None, 0, 0, **settings)
+        self.clips = clips
+        self._clip_index = 0
+        self._clip_count = 1
+    
+    def run(self):
+        try:
+            ffmpeg_path = get_tool_path("ffmpeg.exe")
+            if self.mode == 'compress' and self._single_pass_worthwhile():
+                success = self._run_single_pass(ffmpeg_path)
+            else:
+                # 複製/精準剪輯幾乎不需解碼；片段相隔太遠時也逐段處理
+                success = True
+                self._clip_count = len(self.clips)
+                for i, (start, end, output) in enumerate(self.clips):
+                    self._clip_index = i
+                    self.start_time, self.end_time, self.output_path = start, end, output
+                    if not self._process(ffmpeg_path):
+                        success = False
+                        break
+            
+            if success:
+                self.signals.finished.emit(True, f"批次剪輯完成！共 {len(self.clips)} 個片段。")
+            else:
+                self.signals.finished.emit(False, "剪輯錯誤，請檢查設定或硬體支援。")
+                
+        except Exception as e:
+            self.signals.finished.emit(False, f"錯誤: {str(e)}")
+    
+    def _report_progress(self, percent):
+        # 逐段處理時，把單段進度換算成整體進度
+        super()._report_progress((self._clip_index * 100 + percent) // self._clip_count)
+    
+    def _single_pass_worthwhile(self):
+        # 單次解碼會處理最早到最晚片段之間的每一格，片段間的空白過長時反而較慢
+        span = max(end for _, end, _ in self.clips) - min(start for start, _, _ in self.clips)
+        total = sum(end - start for start, end, _ in self.clips)
+        return span <= total * _SINGLE_PASS_MAX_SPAN_RATIO
+    
+    def _run_single_pass(self, ffmpeg_path):
+        # 來源只解碼一次: split 分流後各自 trim，一次寫出所有片段
+        first = min(start for start, _, _ in self.clips)
+        last = max(end for _, end, _ in self.clips)
+        count = len(self.clips)
+        has_audio = self._source_codec('a:0') is not None
+        
+        cmd = [ffmpeg_path]
+        hwaccel_args, hw_frames = self._hwaccel_args()
+        cmd.extend(hwaccel_args)
+        cmd.extend(['-ss', str(first), '-t', str(last - first), '-i', self.input_path])
+        
+        # 縮放在分流前做一次；變速等濾鏡放在各片段 trim 之後
+        pre_filters = []
+        if self.resolution:
+            pre_filters.append(_scale_filter(self.gpu_vendor, self.resolution, hw_frames))
+        post_filters = []
+        if self.speed != 1.0:
+            post_filters.append(f'setpts={1/self.speed}*PTS')
+        if hw_frames and self.gpu_vendor == 'Intel' and os.name != 'nt':
+            post_filters.append('hwmap=derive_device=qsv,format=qsv')
+        
+        split_labels = ''.join(f'[s{i}]' for i in range(count))
+        graph = [f"[0:v]{','.join(pre_filters + [f'split={count}'])}{split_labels}"]
+        if has_audio:
+            graph.append(f"[0:a]asplit={count}{''.join(f'[t{i}]' for i in range(count))}")
+        for i, (start, end, _) in enumerate(self.clips):
+            rel_start, rel_end = start - first, end - first
+            chain = [f'trim=start={rel_start}:end={rel_end}', 'setpts=PTS-STARTPTS'] + post_filters
+            graph.append(f"[s{i}]{','.join(chain)}[v{i}]")
+            if has_audio:
+                achain = [f'atrim=start={rel_start}:end={rel_end}', 'asetpts=PTS-STARTPTS']
+                if self.speed != 1.0:
+                    achain.append(f'atempo={self.speed}')
+                graph.append(f"[t{i}]{','.join(achain)}[a{i}]")
+        cmd.extend(['-filter_complex', ';'.join(graph)])
+        
+        for i, (_, _, output) in enumerate(self.clips):
+            cmd.extend(['-map', f'[v{i}]'])
+            if has_audio:
+                cmd.extend(['-map', f'[a{i}]', '-c:a', 'aac', '-b:a', '192k'])
+            cmd.extend(self._video_encoder_args())
+            if self.fps:
+                cmd.extend(['-r', str(self.fps)])
+            cmd.extend(self._container_args())
+            cmd.extend(['-y', output])
+        
+        # ffmpeg 回報的是各輸出中最長的時間，以最長片段作為總長度
+        longest = max(end - start for start, end, _ in self.clips) / self.speed
+        return self._run_ffmpeg(cmd, 0, longest) == 0
+
 # --- 主視窗 ---
 class VideoCutter(QMainWindow):
     def __init__(self):
         super().__init__()
         self.video_path = None
+        self._basename_noext = None  # 來源檔名 (不含副檔名)，用於預設輸出檔名
         self.video_duration = 0
+        self._max_ms = 0  # 影片長度 (毫秒)，載入時算一次供微調邊界使用
+        self._step_ms = 0  # 微調步長 (毫秒)，由 step_combo 的選項換算
+        self._last_estimate_key = None  # 上次估算的輸入，沒變就不重算
         self.video_bitrate = 0
-        self.processor = None
+        self._jobs = []  # 已送出、尚未完成的轉檔工作 (依序執行)
+        # 轉檔會佔用同一張顯卡，同時跑多個只會互搶資源，固定一次一個
+        self._gpu_pool = QThreadPool(self)
+        self._gpu_pool.setMaxThreadCount(1)
         self.gpu_checker = None 
+        self._gpu_cache_job = None
+        self.source_info = None
+        self.clips = []
+        self._last_pos_update = 0.0
+        self._probe_job = None
+        
+        # 拖動滑桿時會連續觸發大量訊號，合併成最後一次再估算
+        self._estimate_timer = QTimer(self)
+        self._estimate_timer.setSingleShot(True)
+        self._estimate_timer.setInterval(50)
+        self._estimate_timer.timeout.connect(self._do_estimate_file_size)
         
         self.setAcceptDrops(True)
         self.initUI()
+        self.restore_gpu_check()
         
     def dragEnterEvent(self, event: QDragEnterEvent):
         if event.mimeData().hasUrls():
@@ -318,6 +1015,7 @@ class VideoCutter(QMainWindow):
             QSlider::handle:horizontal:hover { background: #14a085; }
             QComboBox, QSpinBox, QLineEdit, QDoubleSpinBox { background-color: #2d2d2d; color: white; border: 1px solid #3d3d3d; padding: 4px; border-radius: 3px; }
             QComboBox::drop-down { border: none; }
+            QListWidget { background-color: #2d2d2d; color: white; border: 1px solid #3d3d3d; border-radius: 3px; }
             QRadioButton { color: white; font-size: 12px; }
             QProgressBar { border: 1px solid #3d3d3d; border-radius: 4px; text-align: center; color: white; }
             QProgressBar::chunk { background-color: #0d7377; border-radius: 3px; }
@@ -606,6 +1304,34 @@ class VideoCutter(QMainWindow):
         self.file_info_box.setLayout(info_grid)
         right_panel_layout.addWidget(self.file_info_box)
         
+        # --- [新增] 批次片段清單 ---
+        clip_box = QGroupBox("批次片段")
+        clip_layout = QVBoxLayout()
+        clip_layout.setContentsMargins(10, 10, 10, 10)
+        
+        self.clip_list = QListWidget()
+        self.clip_list.setMaximumHeight(110)
+        clip_layout.addWidget(self.clip_list)
+        
+        clip_btn_row = QHBoxLayout()
+        self.add_clip_btn = QPushButton("加入目前範圍")
+        self.add_clip_btn.clicked.connect(self.add_clip)
+        self.add_clip_btn.setEnabled(False)
+        self.remove_clip_btn = QPushButton("移除")
+        self.remove_clip_btn.clicked.connect(self.remove_clip)
+        self.batch_btn = QPushButton("批次輸出")
+        self.batch_btn.setStyleSheet("background-color: #5c2b2b; color: white;")
+        self.batch_btn.clicked.connect(self.process_batch)
+        self.batch_btn.setEnabled(False)
+        clip_btn_row.addWidget(self.add_clip_btn)
+        clip_btn_row.addWidget(self.remove_clip_btn)
+        clip_btn_row.addStretch()
+        clip_btn_row.addWidget(self.batch_btn)
+        clip_layout.addLayout(clip_btn_row)
+        
+        clip_box.setLayout(clip_layout)
+        right_panel_layout.addWidget(clip_box)
+        
         self.info_label = QLabel("") # 保留變數但不顯示，防錯
         self.info_label.setVisible(False)
         right_panel_layout.addStretch()
@@ -624,6 +1350,10 @@ class VideoCutter(QMainWindow):
         self.mode_group_btn.addButton(self.copy_mode_radio)
         settings_layout.addWidget(self.copy_mode_radio)
         
+        self.smart_cut_check = QCheckBox("精準切點 (僅重新編碼頭尾片段)")
+        self.smart_cut_check.setStyleSheet("margin-left: 20px; color: #ccc;")
+        settings_layout.addWidget(self.smart_cut_check)
+        
         self.compress_mode_radio = QRadioButton("進階模式")
         self.compress_mode_radio.toggled.connect(self.toggle_mode_options)
         self.mode_group_btn.addButton(self.compress_mode_radio)
@@ -654,6 +1384,7 @@ class VideoCutter(QMainWindow):
         comp_grid.addWidget(make_lbl("加速:"), 0, 0)
         self.gpu_combo = QComboBox()
         self.gpu_combo.addItems(['CPU', 'NVIDIA', 'AMD', 'Intel'])
+        self.gpu_combo.setToolTip(f"CPU 模式使用 {_X264_THREADS} 個實體核心執行緒編碼 (x264)")
         comp_grid.addWidget(self.gpu_combo, 0, 1)
         comp_grid.addWidget(make_desc("使用顯卡硬體加速轉檔"), 0, 2)
         
@@ -671,6 +1402,9 @@ class VideoCutter(QMainWindow):
         comp_grid.addWidget(make_lbl("分辨率:"), 2, 0)
         self.resolution_combo = QComboBox()
         self.resolution_combo.addItems(['原始', '4K', '2K', '1080p', '720p'])
+        # 依 addItems 順序: 輸出縮放參數 與 預估大小用的碼率倍數
+        self._res_scale = {0: None, 1: '3840:-1', 2: '2560:-1', 3: '1920:-1', 4: '1280:-1'}
+        self._res_mul = {0: 1.0, 1: 1.0, 2: 0.8, 3: 0.6, 4: 0.4}
         comp_grid.addWidget(self.resolution_combo, 2, 1)
         comp_grid.addWidget(make_desc("設定輸出影片解析度"), 2, 2)
         
@@ -708,6 +1442,14 @@ class VideoCutter(QMainWindow):
         comp_grid.addWidget(self.bitrate_spin, 5, 1)
         comp_grid.addWidget(make_desc("控制影片數據流量 (kbps)"), 5, 2)
         
+        # Row 6: NVENC 預設
+        comp_grid.addWidget(make_lbl("NVENC:"), 6, 0)
+        self.nvenc_preset_combo = QComboBox()
+        self.nvenc_preset_combo.addItems(['p1', 'p2', 'p3', 'p4', 'p5', 'p6', 'p7'])
+        self.nvenc_preset_combo.setCurrentText('p5')
+        comp_grid.addWidget(self.nvenc_preset_combo, 6, 1)
+        comp_grid.addWidget(make_desc("NVIDIA 編碼預設 (p1 最快 ~ p7 最佳畫質)"), 6, 2)
+        
         settings_layout.addWidget(self.compress_widget)
         
         # --- [新增] 格式選擇與 GPU 按鈕並排區塊 (移出 Frame 放在下面) ---
@@ -789,13 +1531,26 @@ class VideoCutter(QMainWindow):
         self.bitrate_check.stateChanged.connect(self.estimate_file_size)
         self.bitrate_spin.valueChanged.connect(self.estimate_file_size)
         self.speed_spin.valueChanged.connect(self.estimate_file_size)
+        self.step_combo.currentIndexChanged.connect(self._update_step_ms)
+        self._update_step_ms()
 
     def start_gpu_check(self):
         self.detect_btn.setText("檢測中...")
         self.detect_btn.setEnabled(False)
-        self.gpu_checker = GPUCheckThread()
-        self.gpu_checker.finished.connect(self.on_gpu_check_finished)
-        self.gpu_checker.start()
+        self.gpu_checker = GPUCheckRunnable()
+        self.gpu_checker.signals.finished.connect(self.on_gpu_check_finished, Qt.ConnectionType.QueuedConnection)
+        QThreadPool.globalInstance().start(self.gpu_checker)
+
+    def restore_gpu_check(self):
+        # 啟動時沿用上次的檢測結果 (顯卡、驅動與 ffmpeg 都沒變時)，不顯示報告
+        self._gpu_cache_job = GPUCheckRunnable(cache_only=True)
+        self._gpu_cache_job.signals.finished.connect(self._on_gpu_cache_loaded, Qt.ConnectionType.QueuedConnection)
+        QThreadPool.globalInstance().start(self._gpu_cache_job)
+
+    def _on_gpu_cache_loaded(self, report_text, rec_vendor):
+        index = self.gpu_combo.findText(rec_vendor)
+        if index >= 0:
+            self.gpu_combo.setCurrentIndex(index)
 
     def on_gpu_check_finished(self, report_text, rec_vendor):
         self.detect_btn.setText("檢測是否支持硬體加速")
@@ -817,11 +1572,12 @@ class VideoCutter(QMainWindow):
         # 這些是要鎖定的控制項
         controls_to_toggle = [
             self.gpu_combo, self.speed_spin, self.resolution_combo, self.quality_spin,
-            self.fps_check, self.bitrate_check
+            self.fps_check, self.bitrate_check, self.nvenc_preset_combo
         ]
         
         for widget in controls_to_toggle:
             widget.setEnabled(enable_adv)
+        self.smart_cut_check.setEnabled(not enable_adv)
             
         # FPS 和 碼率 SpinBox 還有額外的 CheckBox 連動邏輯
         if enable_adv:
@@ -843,7 +1599,16 @@ class VideoCutter(QMainWindow):
     
     def load_video(self, file_path):
         self.video_path = file_path
-        self.file_text_label.setText(os.path.basename(file_path))
+        # 清掉前一部影片的資訊，探測完成前不能用舊的長度與碼率剪輯
+        self.source_info = None
+        self.video_duration = 0
+        self.video_bitrate = 0
+        self._max_ms = 0
+        self._last_estimate_key = None
+        self.size_estimate_label.setText("預估大小: -")
+        basename = os.path.basename(file_path)
+        self._basename_noext = os.path.splitext(basename)[0]
+        self.file_text_label.setText(basename)
         self.file_text_label.setStyleSheet("color: #14a085; font-weight: bold; font-size: 14px;")
         
         self.media_player.setSource(QUrl.fromLocalFile(file_path))
@@ -854,9 +1619,15 @@ class VideoCutter(QMainWindow):
         self.step_back_btn.setEnabled(True)
         self.step_fwd_btn.setEnabled(True)
         self.position_slider.setEnabled(True)
-        self.start_slider.setEnabled(True)
-        self.end_slider.setEnabled(True)
-        self.process_btn.setEnabled(True)
+        # 範圍滑桿與匯出按鈕等探測完成後才開放
+        with QSignalBlocker(self.start_slider), QSignalBlocker(self.end_slider):
+            self.start_slider.setValue(0)
+            self.end_slider.setValue(0)
+        self.update_range_labels()
+        self.start_slider.setEnabled(False)
+        self.end_slider.setEnabled(False)
+        self.process_btn.setEnabled(False)
+        self.add_clip_btn.setEnabled(False)
         self.preview_speed_check.setEnabled(True)
         self.jump_start_btn.setEnabled(True)
         self.jump_end_btn.setEnabled(True)
@@ -865,53 +1636,59 @@ class VideoCutter(QMainWindow):
         self.end_back_btn.setEnabled(True)
         self.end_fwd_btn.setEnabled(True)
         
+        self.clips = []
+        self.clip_list.clear()
+        self.batch_btn.setEnabled(False)
+        
         self.preview_speed_check.setChecked(False)
         self.media_player.setPlaybackRate(1.0)
         self.get_video_info()
     
     def get_video_info(self):
-        try:
-            ffprobe_path = get_tool_path("ffprobe.exe")
-            cmd = [ffprobe_path, '-v', 'quiet', '-print_format', 'json',
-                   '-show_format', '-show_streams', self.video_path]
-            startupinfo = None
-            if os.name == 'nt':
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='replace', startupinfo=startupinfo)
-            info = json.loads(result.stdout)
-            
-            duration = float(info['format']['duration'])
-            self.video_duration = duration
-            
-            if 'bit_rate' in info['format']:
-                self.video_bitrate = int(info['format']['bit_rate']) / 1000 
-            
-            video_stream = next((s for s in info['streams'] if s['codec_type'] == 'video'), None)
-            if video_stream:
-                width = video_stream.get('width', 'N/A')
-                height = video_stream.get('height', 'N/A')
-                fps = eval(video_stream.get('r_frame_rate', '0/1'))
-                
-                # 更新資訊卡片
-                self.lbl_res_val.setText(f"{width}x{height}")
-                self.lbl_fps_val.setText(f"{fps:.2f}")
-                self.lbl_bitrate_val.setText(f"{self.video_bitrate:.0f} kbps")
-                self.lbl_dur_val.setText(self.format_time(duration))
-                self.file_info_box.setVisible(True) 
-                
-                self.info_label.setVisible(False)
+        # ffprobe / PyAV 可能要花上數百毫秒，放到背景執行避免凍結畫面
+        self._probe_job = ProbeRunnable(self.video_path)
+        queued = Qt.ConnectionType.QueuedConnection
+        self._probe_job.signals.done.connect(self._on_probe_done, queued)
+        self._probe_job.signals.failed.connect(self._on_probe_failed, queued)
+        QThreadPool.globalInstance().start(self._probe_job)
+    
+    def _on_probe_done(self, path, info):
+        if path != self.video_path:
+            return  # 探測期間已切換到其他影片
+        self.source_info = info
+        
+        duration = info.duration
+        self.video_duration = duration
+        self.video_bitrate = info.bitrate
+        
+        if info.video_codec:
+            # 更新資訊卡片
+            self.lbl_res_val.setText(f"{info.width}x{info.height}")
+            self.lbl_fps_val.setText(f"{info.fps:.2f}")
+            self.lbl_bitrate_val.setText(f"{self.video_bitrate:.0f} kbps")
+            self.lbl_dur_val.setText(self.format_time(duration))
+            self.file_info_box.setVisible(True) 
             
-            max_ms = int(duration * 1000)
-            self.position_slider.setMaximum(max_ms)
+            self.info_label.setVisible(False)
+        
+        max_ms = self._max_ms = int(duration * 1000)
+        self.position_slider.setMaximum(max_ms)
+        # 程式設定數值時暫停訊號，最後只更新一次標籤與預估大小
+        with QSignalBlocker(self.start_slider), QSignalBlocker(self.end_slider):
             self.start_slider.setMaximum(max_ms)
             self.end_slider.setMaximum(max_ms)
             self.end_slider.setValue(max_ms)
-            self.update_range_labels()
-            self.estimate_file_size()
-            
-        except Exception as e:
-            QMessageBox.warning(self, "警告", f"無法讀取影片資訊: {str(e)}")
+        self.start_slider.setEnabled(True)
+        self.end_slider.setEnabled(True)
+        self.process_btn.setEnabled(True)
+        self.add_clip_btn.setEnabled(True)
+        self.update_range_labels()
+        self.estimate_file_size()
+    
+    def _on_probe_failed(self, path, message):
+        if path != self.video_path:
+            return
+        QMessageBox.warning(self, "警告", f"無法讀取影片資訊: {message}")
     
     def toggle_play(self):
         if self.media_player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
@@ -922,17 +1699,19 @@ class VideoCutter(QMainWindow):
             self.play_btn.setText("⏸ 暫停")
             self.toggle_preview_speed()
     
+    def _update_step_ms(self):
+        # 選項文字如 "0.5 秒"，切換時解析一次即可
+        step_seconds = float(self.step_combo.currentText().split()[0])
+        self._step_ms = int(step_seconds * 1000)
+    
     def step_video(self, direction):
         if self.media_player.mediaStatus() == QMediaPlayer.MediaStatus.NoMedia:
             return
-        step_text = self.step_combo.currentText()
-        step_seconds = float(step_text.split()[0])
-        step_ms = int(step_seconds * 1000)
         current_pos = self.media_player.position()
         if direction == 'fwd':
-            new_pos = min(current_pos + step_ms, self.video_duration * 1000)
+            new_pos = min(current_pos + self._step_ms, self._max_ms)
         else:
-            new_pos = max(current_pos - step_ms, 0)
+            new_pos = max(current_pos - self._step_ms, 0)
         self.media_player.setPosition(int(new_pos))
         if self.media_player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
             self.media_player.pause()
@@ -941,15 +1720,11 @@ class VideoCutter(QMainWindow):
     def adjust_range_time(self, target, direction):
         slider = self.start_slider if target == 'start' else self.end_slider
         
-        step_text = self.step_combo.currentText()
-        step_seconds = float(step_text.split()[0])
-        step_ms = int(step_seconds * 1000)
-        
         current_val = slider.value()
         if direction == 'fwd':
-            new_val = min(current_val + step_ms, self.video_duration * 1000)
+            new_val = min(current_val + self._step_ms, self._max_ms)
         else:
-            new_val = max(current_val - step_ms, 0)
+            new_val = max(current_val - self._step_ms, 0)
         
         slider.setValue(int(new_val))
         self.seek_to_range(target)
@@ -961,6 +1736,12 @@ class VideoCutter(QMainWindow):
             self.media_player.setPlaybackRate(1.0)
 
     def update_position(self, position):
+        # 播放中最多約 30 次/秒更新畫面；暫停時 (跳轉、微調) 每次都更新
+        if self.media_player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
+            t = time.monotonic()
+            if t - self._last_pos_update < 0.033:
+                return
+            self._last_pos_update = t
         if not self.position_slider.isSliderDown():
             self.position_slider.setValue(position)
         self.current_time_label.setText(self.format_time(position / 1000, show_ms=True))
@@ -993,16 +1774,35 @@ class VideoCutter(QMainWindow):
         duration = max(0, end - start)
         self.range_info_label.setText(f"剪輯長度: {self.format_time(duration)}")
     
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _fmt(int_sec):
+        # 播放時整數秒會一直重複，快取命中率幾乎是 100%
+        return str(timedelta(seconds=int_sec))
+    
     def format_time(self, seconds, show_ms=False):
-        t = timedelta(seconds=int(seconds))
+        int_sec = int(seconds)
         if show_ms:
-            ms = int((seconds - int(seconds)) * 1000)
-            return f"{str(t)}.{ms:03d}"
-        return str(t)
+            ms = int((seconds - int_sec) * 1000)
+            return f"{self._fmt(int_sec)}.{ms:03d}"
+        return self._fmt(int_sec)
     
     def estimate_file_size(self):
+        self._estimate_timer.start()
+    
+    def _do_estimate_file_size(self):
         if not self.video_path or self.video_bitrate == 0:
             return
+        key = (
+            self.video_path, self.video_bitrate,
+            self.start_slider.value(), self.end_slider.value(),
+            self.copy_mode_radio.isChecked(), self.quality_spin.value(),
+            self.bitrate_check.isChecked(), self.bitrate_spin.value(),
+            self.resolution_combo.currentIndex(), self.speed_spin.value(),
+        )
+        if key == self._last_estimate_key:
+            return
+        self._last_estimate_key = key
         start = self.start_slider.value() / 1000
         end = self.end_slider.value() / 1000
         speed = 1.0
@@ -1017,22 +1817,21 @@ class VideoCutter(QMainWindow):
             size_mb = (self.video_bitrate * duration) / 8 / 1024
             self.size_estimate_label.setText(f"預估大小: {size_mb:.1f} MB (無損)")
         else:
-            if self.bitrate_check.isChecked():
-                bitrate = self.bitrate_spin.value()
-            else:
-                crf = self.quality_spin.value()
-                bitrate = self.video_bitrate * (1 - (crf / 51) * 0.7)
-            
-            resolution_text = self.resolution_combo.currentText()
-            if '720' in resolution_text:
-                bitrate *= 0.4
-            elif '1080' in resolution_text:
-                bitrate *= 0.6
-            elif '2K' in resolution_text:
-                bitrate *= 0.8
-            
-            size_mb = (bitrate * duration) / 8 / 1024
-            self.size_estimate_label.setText(f"預估大小: {size_mb:.1f} MB (壓縮)")
+            # 壓縮後的大小難以精確預測，以樂觀/保守兩組係數顯示範圍
+            lo = self._estimate(duration, 0.8, 0.9)
+            hi = self._estimate(duration, 1.1, 0.5)
+            self.size_estimate_label.setText(f"預估大小: {lo:.1f}–{hi:.1f} MB (壓縮)")
+    
+    def _estimate(self, duration, bitrate_mul, crf_weight):
+        # crf_weight: CRF 拉到 51 時碼率最多減少的比例
+        if self.bitrate_check.isChecked():
+            bitrate = self.bitrate_spin.value()
+        else:
+            crf = self.quality_spin.value()
+            bitrate = self.video_bitrate * (1 - (crf / 51) * crf_weight)
+        
+        bitrate *= self._res_mul[self.resolution_combo.currentIndex()] * bitrate_mul
+        return (bitrate * duration) / 8 / 1024
     
     def process_video(self):
         if not self.video_path:
@@ -1044,12 +1843,18 @@ class VideoCutter(QMainWindow):
             return
         
         output_format = self.format_combo.currentText()
-        default_name = f"{os.path.splitext(os.path.basename(self.video_path))[0]}_cut.{output_format}"
+        default_name = f"{self._basename_noext}_cut.{output_format}"
         output_path, _ = QFileDialog.getSaveFileName(self, "儲存影片", default_name, f"{output_format.upper()} 檔案 (*.{output_format})")
         if not output_path:
             return
         
+        settings = self._collect_export_settings()
+        self._submit_job(VideoProcessor(self.video_path, output_path, start_time, end_time, **settings))
+    
+    def _collect_export_settings(self):
         mode = 'copy' if self.copy_mode_radio.isChecked() else 'compress'
+        if mode == 'copy' and self.smart_cut_check.isChecked():
+            mode = 'smart'
         quality = self.quality_spin.value() if mode == 'compress' else None
         fps = self.fps_spin.value() if mode == 'compress' and self.fps_check.isChecked() else None
         bitrate = self.bitrate_spin.value() if mode == 'compress' and self.bitrate_check.isChecked() else None
@@ -1057,34 +1862,74 @@ class VideoCutter(QMainWindow):
         
         resolution = None
         if mode == 'compress':
-            res_text = self.resolution_combo.currentText()
-            if '原始' not in res_text:
-                resolution = '-1:-1' 
-                if '4K' in res_text: resolution = '3840:-1'
-                if '2K' in res_text: resolution = '2560:-1'
-                if '1080p' in res_text: resolution = '1920:-1'
-                if '720p' in res_text: resolution = '1280:-1'
+            resolution = self._res_scale[self.resolution_combo.currentIndex()]
         
         gpu_vendor = 'CPU'
         if mode == 'compress':
             gpu_vendor = self.gpu_combo.currentText()
         
+        return dict(mode=mode, quality=quality, fps=fps, bitrate=bitrate,
+                    output_format=self.format_combo.currentText(), resolution=resolution,
+                    gpu_vendor=gpu_vendor, speed=speed,
+                    nvenc_preset=self.nvenc_preset_combo.currentText(),
+                    source_info=self.source_info)
+    
+    def _submit_job(self, job):
+        if self._gpu_pool.activeThreadCount() >= 1:
+            QMessageBox.information(self, "已排入佇列", "目前已有轉檔工作進行中，此工作會在前一個完成後自動開始。")
+        # 訊號由背景執行緒發出，明確指定排入 UI 執行緒的事件佇列處理
+        queued = Qt.ConnectionType.QueuedConnection
+        job.signals.progress.connect(self.progress_bar.setValue, queued)
+        job.signals.finished.connect(self.process_finished, queued)
+        self._jobs.append(job)
         self.progress_bar.setVisible(True)
-        self.progress_bar.setValue(0)
-        self.process_btn.setEnabled(False)
+        self._gpu_pool.start(job)
+    
+    def add_clip(self):
+        start = self.start_slider.value() / 1000
+        end = self.end_slider.value() / 1000
+        if start >= end:
+            QMessageBox.warning(self, "錯誤", "開始時間必須小於結束時間！")
+            return
+        self.clips.append((start, end))
+        self.clip_list.addItem(f"{len(self.clips)}. {self.format_time(start, True)} - {self.format_time(end, True)}")
+        self.batch_btn.setEnabled(True)
+    
+    def remove_clip(self):
+        row = self.clip_list.currentRow()
+        if row < 0:
+            return
+        del self.clips[row]
+        self.clip_list.clear()
+        for i, (start, end) in enumerate(self.clips, 1):
+            self.clip_list.addItem(f"{i}. {self.format_time(start, True)} - {self.format_time(end, True)}")
+        self.batch_btn.setEnabled(bool(self.clips))
+    
+    def process_batch(self):
+        if not self.video_path or not self.clips:
+            return
+        output_dir = QFileDialog.getExistingDirectory(self, "選擇輸出資料夾", os.path.dirname(self.video_path))
+        if not output_dir:
+            return
         
-        self.processor = VideoProcessor(
-            self.video_path, output_path, start_time, end_time, 
-            mode, quality, fps, bitrate, output_format, resolution, 
-            gpu_vendor, speed
-        )
-        self.processor.progress.connect(self.progress_bar.setValue)
-        self.processor.finished.connect(self.process_finished)
-        self.processor.start()
+        settings = self._collect_export_settings()
+        clips = [(start, end, os.path.join(output_dir, f"{self._basename_noext}_part{i}.{settings['output_format']}"))
+                 for i, (start, end) in enumerate(self.clips, 1)]
+        # ffmpeg 以 -y 直接覆寫，已存在的檔案先詢問一次
+        existing = [os.path.basename(output) for _, _, output in clips if os.path.exists(output)]
+        if existing:
+            names = "\n".join(existing[:10]) + ("\n..." if len(existing) > 10 else "")
+            reply = QMessageBox.question(self, "檔案已存在",
+                                         f"以下 {len(existing)} 個檔案已存在，是否覆寫？\n{names}")
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+        self._submit_job(BatchVideoProcessor(self.video_path, clips, **settings))
     
     def process_finished(self, success, message):
-        self.progress_bar.setVisible(False)
-        self.process_btn.setEnabled(True)
+        # 單一執行緒依序處理，完成的一定是最早送出的工作
+        self._jobs.pop(0)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(bool(self._jobs))
         if success:
             QMessageBox.information(self, "完成", message)
         else: